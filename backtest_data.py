@@ -0,0 +1,224 @@
+# Data sources for backtest_wayanad.py.
+# Kept in their own module so the page and the startup hook in backtest_app.py
+# import the same functions and therefore share the same st.cache_data entries.
+# Cached lookups raise on failure, because Streamlit never caches an exception
+# and the next call retries. The uncached public wrappers turn failures into
+# fallback values for the page.
+import streamlit as st
+import ee
+import niquests
+from niquests.packages.urllib3.util.retry import Retry
+import numpy as np
+import openmeteo_requests
+import pandas as pd
+
+# --- CONFIGURATION FOR CHOORALMALA DISASTER ---
+PROJECT_ID = ''  # Keep your project ID
+EE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'  # Built for many small compute requests
+EE_WORKLOAD_TAG = 'landslide-backtest-wayanad'  # Groups this app's Earth Engine usage in Cloud Monitoring
+LOCATION_NAME = "Chooralmala, Wayanad (HISTORY: July 30 2024)"
+LAT = 11.54
+LON = 76.13
+
+# TARGET DATES (The Disaster Window)
+TARGET_DATE = "2024-07-30"
+START_DATE = "2024-07-20"
+
+# Shared HTTP session: keeps connections alive so repeat calls skip the TLS handshake.
+# The Open-Meteo client is built on niquests, so the session is a niquests one.
+_OPEN_METEO = openmeteo_requests.Client(session=niquests.Session(
+    pool_connections=4, pool_maxsize=8, retries=Retry(total=2, backoff_factor=0.3)))
+
+
+# --- 1. AUTHENTICATE ---
+def connect_earth_engine():
+    """Connect with the secrets token, or local credentials. Raises instead of prompting for a login"""
+    if "EARTHENGINE_TOKEN" in st.secrets:
+        # We construct credentials from the secret token
+        import json
+        from google.oauth2.credentials import Credentials
+
+        # The secret is a JSON string, so we parse it
+        token_info = json.loads(st.secrets["EARTHENGINE_TOKEN"])
+        creds = Credentials(
+            None,
+            refresh_token=token_info['refresh_token'],
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id="YOUR_CLIENT_ID_IF_ANY",  # Optional usually
+            client_secret="YOUR_CLIENT_SECRET_IF_ANY"  # Optional usually
+        )
+        ee.Initialize(credentials=creds, project=PROJECT_ID, opt_url=EE_HIGH_VOLUME_URL)
+    else:
+        ee.Initialize(project=PROJECT_ID, opt_url=EE_HIGH_VOLUME_URL)
+    ee.data.setWorkloadTag(EE_WORKLOAD_TAG)
+
+
+@st.cache_resource
+def initialize_earth_engine():
+    if "EARTHENGINE_TOKEN" in st.secrets:
+        try:
+            connect_earth_engine()
+            return True
+        except Exception as e:
+            st.error(f"Cloud Auth Failed: {e}")
+            return False
+
+    else:
+        try:
+            connect_earth_engine()
+            return True
+        except:
+            try:
+                ee.Authenticate()
+                connect_earth_engine()
+                return True
+            except Exception as e:
+                st.error(f"Local Auth Failed: {e}")
+                return False
+
+
+# --- 2. FETCH HISTORICAL RAIN (Archive API) ---
+@st.cache_data(ttl=3600, show_spinner=False)  # Archive data never changes, an hour keeps memory in check
+def _fetch_historical_rain(lat, lon, start, end):
+    # FlatBuffers response: values arrive as typed float32 arrays, no JSON parsing
+    params = {
+        'latitude': lat,
+        'longitude': lon,
+        'start_date': start,
+        'end_date': end,
+        'hourly': 'rain',
+    }
+    response = _OPEN_METEO.weather_api("https://archive-api.open-meteo.com/v1/archive",
+                                       params=params, timeout=10)[0]
+    hourly = response.Hourly()
+    rain_arr = hourly.Variables(0).ValuesAsNumpy()
+
+    # Missing hours are NaN. Sum in float64 and round to the API's 0.1mm precision
+    total_rain = round(float(np.nansum(rain_arr, dtype=np.float64)), 1)
+    max_intensity = round(float(np.nanmax(rain_arr)), 1)
+
+    # Chart-ready series (cached with the rest, so no set_index() on every rerun)
+    times = pd.date_range(start=pd.to_datetime(hourly.Time(), unit='s'),
+                          end=pd.to_datetime(hourly.TimeEnd(), unit='s'),
+                          freq=pd.Timedelta(seconds=hourly.Interval()),
+                          inclusive='left')
+    rain_series = pd.Series(rain_arr, index=times, name='rain')
+
+    return total_rain, max_intensity, rain_series
+
+
+def get_historical_rain(lat, lon, start, end):
+    # Runs in a worker thread, so hand the error back for the page to show
+    try:
+        return (*_fetch_historical_rain(lat, lon, start, end), None)
+    except Exception as e:
+        return 0, 0, pd.Series(dtype='float32', name='rain'), f"Weather Archive Error: {e}"
+
+
+# --- 3. FETCH SENTINEL-1 (Structural Radar) ---
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def _fetch_sentinel_stability(lat, lon):
+    """Sentinel-1 VV change at the site between the first and last July 2024 passes"""
+    point = ee.Geometry.Point([lon, lat])
+    roi = point.buffer(500)
+
+    # Look for images in July 2024
+    collection = (ee.ImageCollection('COPERNICUS/S1_GRD')
+                  .filterBounds(roi)
+                  .filterDate('2024-07-01', '2024-07-29')
+                  .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV'))
+                  .filter(ee.Filter.eq('instrumentMode', 'IW'))
+                  .select('VV'))
+
+    count = collection.size()
+
+    # Sort once and take both ends of the list instead of sorting twice
+    imgs = collection.sort('system:time_start').toList(count)
+    img_early = ee.Image(imgs.get(0))
+    img_late = ee.Image(imgs.get(-1))
+
+    diff = img_late.subtract(img_early).abs()
+    change_score = diff.reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=roi,
+        scale=30,  # 30m is plenty for a mean over a 500m disc, ~9x fewer pixels than 10m
+        maxPixels=1e9
+    ).get('VV')
+
+    # Pack everything into one dictionary so it costs a single getInfo() round-trip.
+    # The If() keeps the server from touching the images when the collection is too small.
+    result = ee.Dictionary(ee.Algorithms.If(
+        count.gte(2),
+        ee.Dictionary({
+            'count': count,
+            'last_date': ee.Date(img_late.get('system:time_start')).format('YYYY-MM-dd'),  # Last successful pass
+            'score': change_score,
+        }),
+        ee.Dictionary({'count': count})
+    )).getInfo()
+
+    if result['count'] < 2:
+        return "Data Gap (Sentinel-1 Blind)", 0.0
+
+    last_date = result['last_date']
+    change_score = result['score']
+
+    return f"Last Pass: {last_date}", change_score
+
+
+def get_sentinel_stability(lat, lon):
+    try:
+        return _fetch_sentinel_stability(lat, lon)
+    except Exception as e:
+        return f"Sentinel Error: {e}", 0.0
+
+
+# --- 4. FETCH NASA SMAP (Soil Moisture - The Filler) ---
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def _fetch_smap_moisture(lat, lon, date):
+    """Mean SMAP surface soil moisture around the site over the 3 days before `date`"""
+    point = ee.Geometry.Point([lon, lat])
+
+    # SMAP Level-3 Daily Soil Moisture (9km resolution)
+    # We look at the 3 days leading up to the target date
+    start_look = (pd.to_datetime(date) - pd.Timedelta(days=3)).strftime('%Y-%m-%d')
+
+    dataset = (ee.ImageCollection("NASA/SMAP/SPL3SMP_E/006")
+               .filterBounds(point)
+               .filterDate(start_look, date)
+               .select('soil_moisture_am'))  # Morning pass is better for soil
+
+    count = dataset.size()
+
+    # Get the average moisture over the last 3 days
+    mean_img = dataset.mean()
+
+    # Reduce to get the value at our point
+    moisture_val = mean_img.reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=point,
+        scale=9000  # 9km resolution
+    ).get('soil_moisture_am')
+
+    # One getInfo() round-trip for both the count and the value
+    result = ee.Dictionary(ee.Algorithms.If(
+        count.gt(0),
+        ee.Dictionary({'count': count, 'moisture': moisture_val}),
+        ee.Dictionary({'count': count})
+    )).getInfo()
+
+    if result['count'] == 0:
+        return "No SMAP Data", None
+
+    moisture_val = result['moisture']
+
+    # SMAP returns volumetric water content (cm3/cm3).
+    # > 0.40 is typically very wet/saturated for soil.
+    return "Data Found", moisture_val
+
+
+def get_smap_moisture(lat, lon, date):
+    try:
+        return _fetch_smap_moisture(lat, lon, date)
+    except Exception as e:
+        return f"SMAP Error: {e}", None
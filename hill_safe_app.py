@@ -0,0 +1,54 @@
+# Server entry point for the live dashboard: `streamlit run hill_safe_app.py`
+# Serves hill_safe.py and pre-warms the default location's caches on startup.
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from streamlit.starlette import App
+
+from hill_safe_data import (
+    DEFAULT_LAT,
+    DEFAULT_LON,
+    connect_earth_engine,
+    get_rainfall_data,
+    get_sentinel_stability,
+    get_smap_moisture,
+)
+
+PREWARM_TIMEOUT = 60  # Seconds
+
+
+def prewarm_default_location():
+    """Fill the caches for the default location so the first visitor doesn't wait"""
+    # No session exists yet: skip the interactive login fallback and leave
+    # initialize_earth_engine() uncalled, so a failure here is not cached for the page
+    try:
+        connect_earth_engine()
+    except Exception:
+        return
+
+    # Same parallel fan-out as the page, so startup waits for the slowest source only
+    today = datetime.date.today()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        executor.submit(get_rainfall_data, DEFAULT_LAT, DEFAULT_LON)
+        executor.submit(get_sentinel_stability, DEFAULT_LAT, DEFAULT_LON, today)
+        executor.submit(get_smap_moisture, DEFAULT_LAT, DEFAULT_LON, today)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Runs once before the server accepts connections. A slow source must not
+    # hold up startup: give up waiting (the thread finishes in the background)
+    try:
+        await asyncio.wait_for(asyncio.to_thread(prewarm_default_location), timeout=PREWARM_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+    yield
+
+
+app = App(Path(__file__).with_name("hill_safe.py"), lifespan=lifespan)
+
+if __name__ == "__main__":
+    app.run()
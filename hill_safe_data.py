@@ -0,0 +1,270 @@
+# Data sources for hill_safe.py.
+# Kept in their own module so the page and the startup hook in hill_safe_app.py
+# import the same functions and therefore share the same st.cache_data entries.
+# Cached lookups raise on failure, because Streamlit never caches an exception
+# and the next call retries. The uncached public wrappers turn failures into
+# fallback values for the page.
+import streamlit as st
+import ee
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import niquests
+from niquests.packages.urllib3.util.retry import Retry as NiquestsRetry
+import openmeteo_requests
+import orjson
+import pandas as pd
+import datetime
+
+# --- CONFIGURATION ---
+PROJECT_ID = ''  # Project ID
+EE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'  # Built for many small compute requests
+EE_WORKLOAD_TAG = 'landslide-hill-safe'  # Groups this app's Earth Engine usage in Cloud Monitoring
+
+# Default location shown before the user searches (also pre-warmed at startup)
+DEFAULT_LOCATION_NAME = "Chooralmala, Wayanad"
+DEFAULT_LAT = 11.54
+DEFAULT_LON = 76.13
+
+# Shared HTTP session: keeps connections alive so repeat calls skip the TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+# The Open-Meteo client is built on niquests, so give it its own session with the same pool and retries
+_OPEN_METEO = openmeteo_requests.Client(session=niquests.Session(
+    pool_connections=4, pool_maxsize=8, retries=NiquestsRetry(total=2, backoff_factor=0.3)))
+
+
+# --- GEOCODING FUNCTION (FREE - OpenStreetMap Nominatim) ---
+@st.cache_data(ttl=86400, show_spinner=False)  # Place coordinates don't move; repeat queries are served from cache
+def _geocode(query):
+    """Nominatim search results for `query`, as parsed JSON"""
+    url = "https://nominatim.openstreetmap.org/search"
+    params = {
+        'q': query,
+        'format': 'json',
+        'limit': 5
+    }
+    headers = {
+        'User-Agent': 'HillSafe-LandslideWarning/1.0'
+    }
+
+    response = _SESSION.get(url, params=params, headers=headers, timeout=10)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def search_location(place_name):
+    """Search for a place and get coordinates using free Nominatim API"""
+    try:
+        # Normalize so "Wayanad " and "wayanad" share one cache entry
+        results = _geocode(place_name.strip().lower())
+
+        if results:
+            return results
+        else:
+            return None
+    except Exception as e:
+        st.error(f"Cannot search location: {e}")
+        return None
+
+
+# --- 1. INITIALIZE SATELLITE CONNECTION ---
+def connect_earth_engine():
+    """Connect with the stored credentials. Raises instead of prompting for a login"""
+    ee.Initialize(project=PROJECT_ID, opt_url=EE_HIGH_VOLUME_URL)
+    ee.data.setWorkloadTag(EE_WORKLOAD_TAG)
+
+
+@st.cache_resource
+def initialize_earth_engine():
+    try:
+        connect_earth_engine()
+        return True
+    except Exception as e:
+        try:
+            ee.Authenticate()
+            connect_earth_engine()
+            return True
+        except Exception as auth_error:
+            st.error(f"Cannot connect to satellite system: {auth_error}")
+            return False
+
+
+# --- 2. FETCH RAIN FORECAST (Next 2 Days) ---
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+FORECAST_PARAMS = {
+    'hourly': ['rain', 'precipitation_probability'],  # Variables(0), Variables(1) below
+    'forecast_days': 2,
+}
+
+
+def _summarize_forecast(response):
+    """Turn one Open-Meteo FlatBuffers response into (total rain, max chance, chart series)"""
+    hourly = response.Hourly()
+    rain_arr = hourly.Variables(0).ValuesAsNumpy()
+    chance_arr = hourly.Variables(1).ValuesAsNumpy()
+
+    # 1. Total Rain Expected (Next 48h)
+    # Missing hours are NaN. Sum in float64 and round to the API's 0.1mm precision
+    total_rain_forecast = round(float(np.nansum(rain_arr, dtype=np.float64)), 1)
+
+    # 2. Max Probability (Highest chance of rain in the next 48h)
+    max_chance = float(np.nanmax(chance_arr))
+
+    # Chart-ready series (cached with the rest, so no set_index() on every rerun)
+    times = pd.date_range(start=pd.to_datetime(hourly.Time(), unit='s'),
+                          end=pd.to_datetime(hourly.TimeEnd(), unit='s'),
+                          freq=pd.Timedelta(seconds=hourly.Interval()),
+                          inclusive='left')
+    rain_series = pd.Series(rain_arr, index=times, name='rain')
+
+    return total_rain_forecast, max_chance, rain_series
+
+
+@st.cache_data(ttl=1800, show_spinner=False)  # Forecast refreshes hourly, so keep it fresher
+def _fetch_rainfall(lat, lon):
+    # Request forecast for next 2 days (48 hours)
+    params = {'latitude': lat, 'longitude': lon, **FORECAST_PARAMS}
+    response = _OPEN_METEO.weather_api(FORECAST_URL, params=params, timeout=10)[0]
+
+    return _summarize_forecast(response)
+
+
+def get_rainfall_data(lat, lon):
+    # Runs in a worker thread, so hand the error back for the page to show
+    try:
+        return (*_fetch_rainfall(lat, lon), None)
+    except Exception as e:
+        return 0, 0, pd.Series(dtype='float32', name='rain'), f"Cannot get forecast: {e}"
+
+
+# --- 3. FETCH SENTINEL-1 (Scientific Anomaly Detection) ---
+def _s1_vv(roi, start, end):
+    """Sentinel-1 VV (IW mode) images over `roi` between `start` and `end`"""
+    return (ee.ImageCollection('COPERNICUS/S1_GRD')
+            .filterBounds(roi)
+            .filterDate(start, end)
+            .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV'))
+            .filter(ee.Filter.eq('instrumentMode', 'IW'))
+            .select('VV'))
+
+
+# Cached per day: `day` is part of the cache key, so results roll over at midnight.
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def _fetch_sentinel_stability(lat, lon, day):
+    """Sentinel-1 VV change around the point: latest pass vs the 3-month baseline"""
+    point = ee.Geometry.Point([lon, lat])
+    roi = point.buffer(500)
+
+    # 1. Get the "Current" Image (Last 12 days)
+    # End of `day` (exclusive), so a pass ingested today is still picked up
+    now = datetime.datetime.combine(day, datetime.time.min) + datetime.timedelta(days=1)
+    current_collection = _s1_vv(roi, now - datetime.timedelta(days=12), now)
+
+    current_img = current_collection.sort('system:time_start', False).first()
+
+    # 2. Get the "Baseline" (Average of the last 3 months, EXCLUDING current week)
+    baseline_collection = _s1_vv(roi, now - datetime.timedelta(days=90), now - datetime.timedelta(days=15))
+    baseline_mean = baseline_collection.mean()
+
+    # 3. Calculate the Anomaly (Difference from Normal)
+    diff = current_img.subtract(baseline_mean).abs()
+
+    # Reduce to a score
+    change_score = diff.reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=roi,
+        scale=30,  # 30m is plenty for a mean over a 500m disc, ~9x fewer pixels than 10m
+        maxPixels=1e9
+    ).get('VV')
+
+    # Fetch counts, date and score in a single getInfo() round-trip.
+    # The If() skips the image work on the server when either collection is empty.
+    current_count = current_collection.size()
+    baseline_count = baseline_collection.size()
+    result = ee.Dictionary(ee.Algorithms.If(
+        current_count.gt(0).And(baseline_count.gt(0)),
+        ee.Dictionary({
+            'current_count': current_count,
+            'baseline_count': baseline_count,
+            'current_date': ee.Date(current_img.get('system:time_start')).format('YYYY-MM-dd'),
+            'score': change_score,
+        }),
+        ee.Dictionary({'current_count': current_count, 'baseline_count': baseline_count})
+    )).getInfo()
+
+    if result['current_count'] == 0:
+        return "No recent pass", 0.0, "N/A"
+
+    if result['baseline_count'] == 0:
+        return "No baseline data", 0.0, "N/A"
+
+    current_date = result['current_date']
+    change_score = result['score']
+
+    return "Active", change_score, current_date
+
+
+def get_sentinel_stability(lat, lon, day):
+    try:
+        return _fetch_sentinel_stability(lat, lon, day)
+    except Exception as e:
+        return f"Error: {e}", 0.0, "Error"
+
+
+# --- 4. FETCH NASA SMAP (Soil Moisture Fallback) ---
+@st.cache_data(ttl=6 * 3600, show_spinner=False)
+def _fetch_smap_moisture(lat, lon, day):
+    """Mean SMAP surface soil moisture around the point over the last 3 days"""
+    point = ee.Geometry.Point([lon, lat])
+
+    # Look at the last 3 days for SMAP data
+    now = datetime.datetime.combine(day, datetime.time.min)
+    start_date = (now - datetime.timedelta(days=3)).strftime('%Y-%m-%d')
+    end_date = now.strftime('%Y-%m-%d')
+
+    dataset = (ee.ImageCollection("NASA/SMAP/SPL3SMP_E/006")
+               .filterBounds(point)
+               .filterDate(start_date, end_date)
+               .select('soil_moisture_am'))
+
+    count = dataset.size()
+
+    # Get the latest image date
+    latest_img = dataset.sort('system:time_start', False).first()
+
+    # Get average moisture
+    mean_img = dataset.mean()
+    moisture_val = mean_img.reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=point,
+        scale=9000
+    ).get('soil_moisture_am')
+
+    # One getInfo() round-trip for the count, date and value
+    result = ee.Dictionary(ee.Algorithms.If(
+        count.gt(0),
+        ee.Dictionary({
+            'count': count,
+            'last_pass_date': ee.Date(latest_img.get('system:time_start')).format('YYYY-MM-dd'),
+            'moisture': moisture_val,
+        }),
+        ee.Dictionary({'count': count})
+    )).getInfo()
+
+    if result['count'] == 0:
+        return "No recent data", None, "N/A"
+
+    last_pass_date = result['last_pass_date']
+    moisture_val = result['moisture']
+
+    return "Working", moisture_val, last_pass_date
+
+
+def get_smap_moisture(lat, lon, day):
+    try:
+        return _fetch_smap_moisture(lat, lon, day)
+    except Exception as e:
+        return f"Error: {e}", None, "Error"